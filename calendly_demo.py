@@ -0,0 +1,402 @@
+"""
+Calendly API Integration - Production Ready
+Generated by CloudEagle AI Integration Builder
+"""
+
+import orjson
+import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+from typing import Dict, Iterator, List, Optional
+from concurrent.futures import ThreadPoolExecutor
+from itertools import islice
+import os
+import random
+import logging
+from datetime import datetime, timedelta
+
+# Configure logging
+logging.basicConfig(
+    level=logging.INFO,
+    format='%(asctime)s - %(name)s - %(levelname)s - %(message)s'
+)
+logger = logging.getLogger(__name__)
+
+
+class JitteredRetry(Retry):
+    """urllib3 Retry with jittered backoff, so concurrent workers don't retry in lockstep"""
+    
+    MAX_RETRY_AFTER = 60  # seconds
+    
+    def get_backoff_time(self) -> float:
+        """Exponential backoff scaled by a random factor in [0.5, 1.5)"""
+        return super().get_backoff_time() * random.uniform(0.5, 1.5)
+    
+    def get_retry_after(self, response) -> Optional[float]:
+        """Server-requested Retry-After wait, capped and jittered by +/-20%"""
+        retry_after = super().get_retry_after(response)
+        if retry_after is None:
+            return None
+        return min(retry_after, self.MAX_RETRY_AFTER) * random.uniform(0.8, 1.2)
+
+
+class CalendlyAuth:
+    """Handles OAuth 2.0 authentication for Calendly API"""
+    
+    def __init__(self, client_id: str, client_secret: str):
+        """
+        Initialize Calendly authentication
+        
+        Args:
+            client_id: OAuth client ID from Calendly
+            client_secret: OAuth client secret from Calendly
+        """
+        self.client_id = client_id
+        self.client_secret = client_secret
+        self.access_token: Optional[str] = None
+        self.refresh_token: Optional[str] = None
+        self.token_expires_at: Optional[datetime] = None
+        self.base_auth_url = "https://auth.calendly.com/oauth"
+        
+        logger.info("Calendly authentication initialized")
+    
+    def get_authorization_url(self, redirect_uri: str) -> str:
+        """
+        Generate OAuth authorization URL
+        
+        Args:
+            redirect_uri: Callback URL after authorization
+            
+        Returns:
+            Authorization URL for user to visit
+        """
+        return (
+            f"{self.base_auth_url}/authorize?"
+            f"client_id={self.client_id}&"
+            f"redirect_uri={redirect_uri}&"
+            f"response_type=code"
+        )
+    
+    def exchange_code_for_token(self, code: str, redirect_uri: str) -> Dict:
+        """
+        Exchange authorization code for access token
+        
+        Args:
+            code: Authorization code from OAuth callback
+            redirect_uri: Same redirect URI used in authorization
+            
+        Returns:
+            Token response with access_token and refresh_token
+        """
+        try:
+            response = requests.post(
+                f"{self.base_auth_url}/token",
+                data={
+                    "grant_type": "authorization_code",
+                    "code": code,
+                    "redirect_uri": redirect_uri,
+                    "client_id": self.client_id,
+                    "client_secret": self.client_secret
+                },
+                timeout=30
+            )
+            response.raise_for_status()
+            
+            token_data = orjson.loads(response.content)
+            self.access_token = token_data.get("access_token")
+            self.refresh_token = token_data.get("refresh_token")
+            
+            # Calculate expiration (Calendly tokens expire in 2 hours)
+            expires_in = token_data.get("expires_in", 7200)
+            self.token_expires_at = datetime.now() + timedelta(seconds=expires_in)
+            
+            logger.info("Successfully obtained access token")
+            return token_data
+            
+        except requests.exceptions.RequestException as e:
+            logger.error(f"Token exchange failed: {str(e)}")
+            raise
+    
+    def refresh_access_token(self) -> Dict:
+        """
+        Refresh expired access token using refresh token
+        
+        Returns:
+            New token response
+        """
+        if not self.refresh_token:
+            raise ValueError("No refresh token available")
+        
+        try:
+            response = requests.post(
+                f"{self.base_auth_url}/token",
+                data={
+                    "grant_type": "refresh_token",
+                    "refresh_token": self.refresh_token,
+                    "client_id": self.client_id,
+                    "client_secret": self.client_secret
+                },
+                timeout=30
+            )
+            response.raise_for_status()
+            
+            token_data = orjson.loads(response.content)
+            self.access_token = token_data.get("access_token")
+            
+            # Update expiration
+            expires_in = token_data.get("expires_in", 7200)
+            self.token_expires_at = datetime.now() + timedelta(seconds=expires_in)
+            
+            logger.info("Access token refreshed successfully")
+            return token_data
+            
+        except requests.exceptions.RequestException as e:
+            logger.error(f"Token refresh failed: {str(e)}")
+            raise
+    
+    def get_valid_token(self) -> str:
+        """
+        Get valid access token, refreshing if necessary
+        
+        Returns:
+            Valid access token
+        """
+        # Check if token needs refresh (refresh 5 minutes before expiry)
+        if self.token_expires_at:
+            time_until_expiry = (self.token_expires_at - datetime.now()).total_seconds()
+            if time_until_expiry < 300:  # Less than 5 minutes
+                logger.info("Token expiring soon, refreshing...")
+                self.refresh_access_token()
+        
+        return self.access_token
+
+
+class CalendlyClient:
+    """Main Calendly API client"""
+    
+    def __init__(self, auth: CalendlyAuth):
+        """
+        Initialize Calendly client
+        
+        Args:
+            auth: CalendlyAuth instance with valid credentials
+        """
+        self.auth = auth
+        self.base_url = "https://api.calendly.com"
+        
+        # Keep-alive connection pool sized for concurrent page fetches, with
+        # urllib3 retrying idempotent requests (honouring Retry-After on 429)
+        adapter = HTTPAdapter(
+            pool_connections=32,
+            pool_maxsize=32,
+            max_retries=JitteredRetry(
+                total=5,
+                backoff_factor=0.5,
+                status_forcelist=[429, 500, 502, 503, 504],
+                allowed_methods=["GET"],
+                respect_retry_after_header=True
+            )
+        )
+        self.session = requests.Session()
+        self.session.mount("https://", adapter)
+        self.session.headers.update({
+            "Content-Type": "application/json"
+        })
+        
+        logger.info("Calendly client initialized")
+    
+    def _make_request(
+        self, 
+        method: str, 
+        endpoint: str, 
+        **kwargs
+    ) -> requests.Response:
+        """
+        Make authenticated API request (retries are handled by the session adapter)
+        
+        Args:
+            method: HTTP method (GET, POST, etc.)
+            endpoint: API endpoint path
+            **kwargs: Additional request parameters
+            
+        Returns:
+            Response object
+        """
+        url = f"{self.base_url}/{endpoint.lstrip('/')}"
+        
+        # Add authorization header
+        token = self.auth.get_valid_token()
+        headers = kwargs.pop('headers', {})
+        headers['Authorization'] = f'Bearer {token}'
+        
+        try:
+            response = self.session.request(
+                method=method,
+                url=url,
+                headers=headers,
+                timeout=30,
+                **kwargs
+            )
+            response.raise_for_status()
+            return response
+            
+        except requests.exceptions.RequestException as e:
+            logger.error(f"{method} {endpoint} failed: {str(e)}")
+            raise
+    
+    def get_current_user(self) -> Dict:
+        """
+        Get current authenticated user
+        
+        Returns:
+            User object
+        """
+        response = self._make_request('GET', '/users/me')
+        return orjson.loads(response.content)
+    
+    def _paginate(
+        self,
+        endpoint: str,
+        params: Dict,
+        max_results: Optional[int] = None
+    ) -> Iterator[Dict]:
+        """
+        Yield records from every page of a cursor-paginated endpoint
+        
+        Calendly page tokens are opaque, so pages cannot be requested in
+        parallel. Instead the next page is fetched in the background while
+        the caller works through the current one.
+        
+        Args:
+            endpoint: API endpoint path
+            params: Query parameters for the first page
+            max_results: Stop requesting pages once this many records are seen
+            
+        Yields:
+            Records from each page's collection, in order
+        """
+        params = dict(params)
+        fetched = 0
+        
+        with ThreadPoolExecutor(max_workers=1) as prefetcher:
+            future = prefetcher.submit(self._make_request, 'GET', endpoint, params=dict(params))
+            
+            while future is not None:
+                data = orjson.loads(future.result().content)
+                records = data.get('collection', [])
+                fetched += len(records)
+                
+                # Check for next page, and start fetching it before handing records back
+                pagination = data.get('pagination', {})
+                page_token = pagination.get('next_page_token')
+                future = None
+                if page_token and (max_results is None or fetched < max_results):
+                    params['page_token'] = page_token
+                    future = prefetcher.submit(self._make_request, 'GET', endpoint, params=dict(params))
+                    logger.info(f"Fetched {fetched} records from {endpoint} so far...")
+                
+                yield from records
+    
+    def list_users(self, organization_uri: str, max_results: int = 100) -> List[Dict]:
+        """
+        List all users in organization with automatic pagination
+        
+        Args:
+            organization_uri: Organization URI
+            max_results: Maximum number of results to return
+            
+        Returns:
+            List of user objects
+        """
+        params = {
+            'organization': organization_uri,
+            'count': min(100, max_results)
+        }
+        
+        all_users = list(islice(self._paginate('/users', params, max_results), max_results))
+        
+        logger.info(f"Total users retrieved: {len(all_users)}")
+        return all_users
+    
+    def get_event_types(self, user_uri: str) -> List[Dict]:
+        """
+        Get event types for a user
+        
+        Args:
+            user_uri: User URI
+            
+        Returns:
+            List of event type objects
+        """
+        params = {'user': user_uri, 'count': 100}
+        
+        all_event_types = list(self._paginate('/event_types', params))
+        
+        logger.info(f"Retrieved {len(all_event_types)} event types")
+        return all_event_types
+    
+    def get_scheduled_events(
+        self, 
+        organization_uri: str,
+        min_start_time: Optional[str] = None,
+        max_start_time: Optional[str] = None
+    ) -> List[Dict]:
+        """
+        Get scheduled events with optional date filtering
+        
+        Args:
+            organization_uri: Organization URI
+            min_start_time: Filter events after this time (ISO 8601)
+            max_start_time: Filter events before this time (ISO 8601)
+            
+        Returns:
+            List of event objects
+        """
+        params = {
+            'organization': organization_uri,
+            'count': 100
+        }
+        
+        if min_start_time:
+            params['min_start_time'] = min_start_time
+        if max_start_time:
+            params['max_start_time'] = max_start_time
+        
+        all_events = list(self._paginate('/scheduled_events', params))
+        
+        logger.info(f"Retrieved {len(all_events)} scheduled events")
+        return all_events
+
+
+# Example usage
+if __name__ == "__main__":
+    # Initialize from environment variables (never hardcode!)
+    client_id = os.environ.get("CALENDLY_CLIENT_ID")
+    client_secret = os.environ.get("CALENDLY_CLIENT_SECRET")
+    
+    if not client_id or not client_secret:
+        raise ValueError("Missing CALENDLY_CLIENT_ID or CALENDLY_CLIENT_SECRET")
+    
+    # Set up authentication
+    auth = CalendlyAuth(client_id=client_id, client_secret=client_secret)
+    
+    # For OAuth flow, you would:
+    # 1. Redirect user to: auth.get_authorization_url(redirect_uri)
+    # 2. Handle callback and exchange code
+    # auth.exchange_code_for_token(code, redirect_uri)
+    
+    # Create client
+    client = CalendlyClient(auth=auth)
+    
+    # Get current user
+    user = client.get_current_user()
+    print(f"Authenticated as: {user['resource']['name']}")
+    
+    # List users in organization
+    org_uri = user['resource']['current_organization']
+    users = client.list_users(organization_uri=org_uri, max_results=50)
+    print(f"Found {len(users)} users")
+    
+    # Get scheduled events
+    events = client.get_scheduled_events(organization_uri=org_uri)
+    print(f"Found {len(events)} scheduled events")
@@ -6,10 +6,13 @@ Using Claude Sonnet 4 for production-grade code generation
 import streamlit as st
 import anthropic
 import json
-import time
-from datetime import datetime
+import re
+import hashlib
+import threading
+from concurrent.futures import ThreadPoolExecutor
 from typing import List, Dict, Optional, Any, Tuple
 from dataclasses import dataclass
+from pathlib import Path
 
 # Permission Modes
 class PermissionMode:
@@ -82,6 +85,9 @@ class DataValidator:
             records_validated=len(records)
         )
 
+# Pre-generated Calendly integration served in demo mode
+DEMO_CODE_PATH = Path(__file__).with_name("calendly_demo.py")
+
 # Page configuration
 st.set_page_config(
     page_title="CloudEagle AI Integration Builder",
@@ -91,7 +97,7 @@ st.set_page_config(
 )
 
 # Custom CSS for professional styling
-st.markdown("""
+_CSS = """
 <style>
     .main-header {
         background: linear-gradient(135deg, #0078d4 0%, #0063b1 100%);
@@ -143,33 +149,168 @@ st.markdown("""
         font-weight: bold;
         color: #28a745;
     }
+    .deploy-progress {
+        height: 0.5rem;
+        background: #e9ecef;
+        border-radius: 5px;
+        overflow: hidden;
+        margin: 1rem 0;
+    }
+    .deploy-progress > div {
+        height: 100%;
+        background: #0078d4;
+        animation: deploy-fill 2s ease-out forwards;
+    }
+    @keyframes deploy-fill {
+        from { width: 0%; }
+        to { width: 100%; }
+    }
 </style>
-""", unsafe_allow_html=True)
+"""
+
+# HTML blocks for the wizard steps; parameterized ones are filled with str.format
+STEP_BADGE_TMPL = '<div class="step-badge">Step {n} of 5: {title}</div>'
+
+METRIC_SCORE_TMPL = '<div class="metric-score">{score:.1f}/10</div>'
+
+QUALITY_METRIC_TMPL = """
+<div class="code-quality-metric">
+    <strong>{name}</strong><br>
+    {status}
+</div>
+"""
+
+SANDBOX_WARNING_HTML = """
+<div class="warning-box">
+    🔒 <strong>Sandbox Environment:</strong> Test your integration safely before deploying to production. 
+    No real data will be affected.
+</div>
+"""
+
+WARNING_BOX_PROD = """
+<div class="warning-box">
+    ⚠️ <strong>Production Deployment:</strong> You're about to deploy this integration to your production environment.
+</div>
+"""
+
+TESTS_PASSED_TMPL = """
+<div class="success-box">
+    <h4>✅ All Tests Passed! ({passed}/{total})</h4>
+    <p>Your integration is ready for production deployment.</p>
+    <p><strong>Safety Mode:</strong> {mode}</p>
+</div>
+"""
+
+# Progress bar animates in the browser - no server-side sleeps or per-step updates
+DEPLOY_PROGRESS_HTML = '<div class="deploy-progress"><div></div></div>'
+
+DEPLOY_COMPLETE_HTML = """
+<div class="success-box">
+    <h4>🎉 Deployment Complete!</h4>
+    <p>Your Calendly integration is now live in production.</p>
+    <p><strong>Next Steps:</strong></p>
+    <ul>
+        <li>Monitor the dashboard for API health</li>
+        <li>Check logs for any errors</li>
+        <li>Set up alerting rules</li>
+    </ul>
+</div>
+"""
 
 # Initialize session state
-if 'step' not in st.session_state:
-    st.session_state.step = 1
-if 'generated_code' not in st.session_state:
-    st.session_state.generated_code = None
-if 'api_doc_url' not in st.session_state:
-    st.session_state.api_doc_url = ""
-if 'auth_method' not in st.session_state:
-    st.session_state.auth_method = "OAuth 2.0"
-if 'sandbox_passed' not in st.session_state:
-    st.session_state.sandbox_passed = False
-if 'ai_insights' not in st.session_state:
-    st.session_state.ai_insights = []
-if 'permission_mode' not in st.session_state:
-    st.session_state.permission_mode = PermissionMode.READ_ONLY  # Default to safe mode
-if 'selected_endpoints' not in st.session_state:
-    st.session_state.selected_endpoints = []
-if 'validation_results' not in st.session_state:
-    st.session_state.validation_results = {}
+_SESSION_DEFAULTS = {
+    "step": 1,
+    "generated_code": None,
+    "api_doc_url": "",
+    "auth_method": "OAuth 2.0",
+    "sandbox_passed": False,
+    "ai_insights": [],
+    "permission_mode": PermissionMode.READ_ONLY,  # Default to safe mode
+    "selected_endpoints": [],
+    "validation_results": {},
+    "code_index": None,  # Step 3 section slices, see store_generated_code()
+    "deploy_timestamp": None,  # "Generated on" stamp for the Step 5 README
+    "deployed": False,  # Step 5 deploy clicked for the current code
+    "generation": None  # In-flight background Claude call, if any
+}
+for key, value in _SESSION_DEFAULTS.items():
+    st.session_state.setdefault(key, value)
+
+# Concrete authentication methods; one Claude call generates a variant for each
+AUTH_METHODS = ["OAuth 2.0", "API Key", "Bearer Token"]
+
+# Step 1 choice served by whichever AUTH_METHODS variant the documentation specifies
+AUTO_DETECT = "Auto-detect"
+
+# Output token budget per generated variant, by target language. calendly_demo.py, the
+# reference output, is ~13.6KB (~4k tokens), and the prompt asks for a bit more than it has
+_MAX_TOKENS_PER_VARIANT = {"Python": 5000}
+
+# Marker line Claude puts before each variant, e.g. "# === AUTH METHOD: API Key ==="
+_VARIANT_MARKER_RX = re.compile(r"^# === AUTH METHOD: (.+?) ===[ \t]*$", re.MULTILINE)
+
+# Line before the first variant naming the documented method, so AUTO_DETECT can reuse it
+_DOCUMENTED_MARKER_RX = re.compile(r"^# === DOCUMENTED AUTH METHOD: (.+?) ===[ \t]*$", re.MULTILINE)
+
+# Claude request settings; everything that shapes the generated code lives here
+_CLAUDE_MODEL = "claude-sonnet-4-20250514"
+_CLAUDE_TEMPERATURE = 0.3  # Lower temperature for more consistent code
+_SYSTEM_PROMPT_TMPL = "Return only {language} code, no explanations, no markdown fences."
+
+# Craft the prompt based on our research findings
+_PROMPT_TMPL = """Write production-grade {language} integration code for the API documented at:
+{api_doc_url}
+
+Write one standalone module (with its own imports) for EACH authentication method, in this order:
+{auth_methods}.
+
+Each module: auth with token refresh where applicable and credentials from environment
+variables; an API client class (base URL, rate-limit awareness, API versioning); typed
+methods for users and usage/analytics data; auto-detected pagination (cursor, offset or
+link-header) behind an iterator - fetch pages concurrently (at most 8 in flight) when
+offsets or totals allow it, otherwise prefetch the next page while the current one is
+processed; a requests.Session with a mounted HTTPAdapter (pool_maxsize sized for that
+concurrency, urllib3 Retry with jittered backoff and capped, jittered Retry-After on 429)
+and API-specific errors; structured logging. Parse JSON with orjson.loads(response.content)
+rather than response.json(). No hardcoded credentials, PEP 8, type hints, concise docstrings.
+
+First output one line naming which of those methods the documentation specifies, exactly like:
+# === DOCUMENTED AUTH METHOD: <method> ===
+Then start each module with a marker line exactly like: # === AUTH METHOD: <method> ==="""
+
+# Part of the generation cache key: st.cache_data only hashes the cached function's own
+# source, so persisted results from an older prompt, model or output format are never reused
+_GENERATION_VERSION = hashlib.sha256(repr((
+    _CLAUDE_MODEL, _CLAUDE_TEMPERATURE, _SYSTEM_PROMPT_TMPL, _PROMPT_TMPL,
+    _MAX_TOKENS_PER_VARIANT, AUTH_METHODS, _VARIANT_MARKER_RX.pattern, _DOCUMENTED_MARKER_RX.pattern
+)).encode("utf-8")).hexdigest()[:16]
 
 # Claude API Integration
+@st.cache_resource(show_spinner=False)
+def _get_anthropic_client(api_key: str) -> anthropic.Anthropic:
+    """Shared Anthropic client per API key, reused across reruns and sessions"""
+    return anthropic.Anthropic(api_key=api_key)
+
+class GenerationCancelled(Exception):
+    """Raised from the streaming callback to abort a generation the user cancelled"""
+
+class _GenerationCacheMiss(Exception):
+    """Raised by a cache lookup that found nothing (exceptions are never cached)"""
+
+class _IncompleteGeneration(Exception):
+    """Raised instead of caching a batch missing variants; `result` holds the complete ones"""
+    
+    def __init__(self, message, result):
+        super().__init__(message)
+        self.result = result
+
 def generate_integration_code(api_doc_url, auth_method, language="Python"):
     """
     Generate integration code using Claude Sonnet 4
+    
+    Demo mode and cache hits return the code straight away. Otherwise the Claude call
+    is submitted to a background thread, tracked in st.session_state.generation, and
+    None is returned; collect the result with finish_generation() once it is done.
     """
     
     # Check if API key is configured
@@ -177,102 +318,196 @@ def generate_integration_code(api_doc_url, auth_method, language="Python"):
         st.warning("⚠️ Anthropic API key not configured. Using demo mode with pre-generated code.")
         return generate_demo_code(api_doc_url, auth_method)
     
+    api_key = st.secrets.get('ANTHROPIC_API_KEY', st.session_state.get('anthropic_key'))
+    # Hash the key so it never appears in the cache, while still giving each key its own slot
+    api_key_hash = hashlib.sha256(api_key.encode("utf-8")).hexdigest()
+    
+    generation = {
+        "api_doc_url": api_doc_url,
+        "auth_method": auth_method,
+        "language": language,
+        "api_key_hash": api_key_hash
+    }
+    
     try:
-        # Initialize Anthropic client
-        api_key = st.secrets.get('ANTHROPIC_API_KEY', st.session_state.get('anthropic_key'))
-        client = anthropic.Anthropic(api_key=api_key)
-        
-        # Craft the prompt based on our research findings
-        prompt = f"""You are an expert integration engineer building production-grade API integration code.
-
-API Documentation URL: {api_doc_url}
-Authentication Method: {auth_method}
-Target Language: {language}
-
-Based on the API documentation, generate a complete, production-ready integration that includes:
-
-1. **Authentication Setup**
-   - Handle {auth_method}
-   - Token refresh logic (if applicable)
-   - Secure credential management using environment variables
-   - Error handling for auth failures
-
-2. **API Client Class**
-   - Base URL configuration
-   - Request/response handling
-   - Rate limit awareness from API docs
-   - Version handling (if required by API)
-
-3. **Data Retrieval Methods**
-   - Get users endpoint
-   - Get usage/analytics data
-   - Handle nested resources
-   - Proper typing with type hints
-
-4. **Pagination Implementation**
-   - Auto-detect pagination type (cursor, offset, link-header)
-   - Iterator pattern for seamless pagination
-   - Handle empty responses
-
-5. **Error Handling**
-   - Retry logic with exponential backoff
-   - Rate limit handling (429)
-   - Network errors
-   - API-specific error codes
-
-6. **Logging**
-   - Structured logging with correlation IDs
-   - Log levels (INFO, WARNING, ERROR)
-   - API call tracking
-
-CRITICAL REQUIREMENTS:
-- NO hardcoded credentials
-- Follow PEP 8 style guide
-- Include comprehensive docstrings
-- Add type hints
-- Use best practices from the API documentation
-- Implement defensive programming
-
-Generate ONLY the Python code with clear comments. Make it production-ready."""
-
-        # Generate code using Claude
-        with st.spinner("🤖 AI is analyzing API documentation and generating code..."):
-            message = client.messages.create(
-                model="claude-sonnet-4-20250514",
-                max_tokens=4000,
-                temperature=0.3,  # Lower temperature for more consistent code
-                messages=[
-                    {"role": "user", "content": prompt}
-                ]
-            )
-            
-            generated_code = message.content[0].text
-            
-            # Extract AI insights
-            insights = extract_insights(generated_code, api_doc_url)
-            st.session_state.ai_insights = insights
-            
-            return generated_code
-            
+        return _select_variant(generation, _generate_integration_code_cached(
+            api_doc_url, language, api_key_hash, _GENERATION_VERSION
+        ))
+    except _GenerationCacheMiss:
+        pass
     except Exception as e:
-        st.error(f"❌ Error generating code: {str(e)}")
-        st.info("Falling back to demo mode...")
-        return generate_demo_code(api_doc_url, auth_method)
+        return _generation_failed(generation, e)
+    
+    if 'executor' not in st.session_state:
+        st.session_state.executor = ThreadPoolExecutor(max_workers=2)
+    
+    # The worker touches no st APIs - it only appends streamed text for the script
+    # thread to render, and caching happens back on the script thread
+    chunks = []
+    cancelled = threading.Event()
+    
+    def on_text(text):
+        if cancelled.is_set():
+            raise GenerationCancelled()
+        chunks.append(text)
+    
+    generation["future"] = st.session_state.executor.submit(
+        _call_claude, _get_anthropic_client(api_key), api_doc_url, language, on_text
+    )
+    generation["chunks"] = chunks
+    generation["cancelled"] = cancelled
+    st.session_state.generation = generation
+    return None
+
+def cancel_generation():
+    """Abort the in-flight background generation, if any"""
+    generation = st.session_state.generation
+    if generation is not None:
+        generation["cancelled"].set()
+        generation["future"].cancel()
+        st.session_state.generation = None
+
+def finish_generation():
+    """Collect the finished background generation and return its code"""
+    generation = st.session_state.generation
+    st.session_state.generation = None
+    
+    try:
+        result = _generate_integration_code_cached(
+            generation["api_doc_url"], generation["language"], generation["api_key_hash"],
+            _GENERATION_VERSION, _fetch=generation["future"].result
+        )
+    except _IncompleteGeneration as e:
+        # Not cached, but a variant that did complete can still serve this request
+        if generation["auth_method"] not in e.result[0]:
+            return _generation_failed(generation, e)
+        result = e.result
+    except Exception as e:
+        return _generation_failed(generation, e)
+    
+    return _select_variant(generation, result)
+
+def _select_variant(generation, result):
+    """Pick the requested auth method's code (and insights) out of a batched result"""
+    variants, insights = result
+    auth_method = generation["auth_method"]
+    
+    if auth_method not in variants:
+        raise ValueError(f"Claude's response did not include a {auth_method} variant")
+    
+    st.session_state.ai_insights = insights[auth_method]
+    return variants[auth_method]
+
+def _generation_failed(generation, error):
+    """Report a failed generation and fall back to the demo code"""
+    st.error(f"❌ Error generating code: {str(error)}")
+    st.info("Falling back to demo mode...")
+    return generate_demo_code(generation["api_doc_url"], generation["auth_method"])
+
+@st.cache_data(show_spinner=False, persist="disk", max_entries=128)
+def _generate_integration_code_cached(api_doc_url, language, api_key_hash, generation_version, _fetch=None):
+    """
+    Cache of ({method: code}, {method: insights}) per URL, language, API key and
+    _GENERATION_VERSION.
+    
+    Called without `_fetch` this is a lookup, and a miss raises _GenerationCacheMiss.
+    Called with `_fetch` (the finished Claude call), a miss stores its parsed result.
+    Only `api_key_hash` reaches the cache key, never the key itself. Must run on the
+    script thread: st.cache_data neither reads nor writes without a script run context.
+    Entries persist to disk so app restarts reuse them; persisted caches ignore ttl.
+    """
+    if _fetch is None:
+        raise _GenerationCacheMiss()
+    
+    text, truncated = _fetch()
+    if truncated:
+        # The token budget ran out mid-module - drop that incomplete last variant
+        markers = list(_VARIANT_MARKER_RX.finditer(text))
+        text = text[:markers[-1].start()] if markers else ""
+    
+    variants = split_code_variants(text)
+    
+    # Extract AI insights
+    insights = {method: extract_insights(code, api_doc_url) for method, code in variants.items()}
+    
+    # Raise rather than cache an incomplete batch, so the next Generate calls Claude again
+    missing = set(AUTH_METHODS) - set(variants)
+    if missing:
+        reason = ("was cut off at the output token limit" if truncated
+                  else "did not include every variant")
+        raise _IncompleteGeneration(
+            f"Claude's response {reason} (missing: {', '.join(sorted(missing))})",
+            (variants, insights)
+        )
+    
+    return variants, insights
+
+def _call_claude(client, api_doc_url, language, on_text):
+    """Stream one batched generation covering all AUTH_METHODS; return (raw text, truncated)"""
+    
+    prompt = _PROMPT_TMPL.format(
+        language=language, api_doc_url=api_doc_url, auth_methods=", ".join(AUTH_METHODS)
+    )
+
+    # Generate code using Claude, streaming so the UI can show progress
+    chunks = []
+    with client.messages.stream(
+        model=_CLAUDE_MODEL,
+        # Output tokens drive latency, so budget per variant rather than a flat ceiling
+        max_tokens=_MAX_TOKENS_PER_VARIANT.get(language, 1800) * len(AUTH_METHODS),
+        temperature=_CLAUDE_TEMPERATURE,
+        system=_SYSTEM_PROMPT_TMPL.format(language=language),
+        messages=[
+            {"role": "user", "content": prompt}
+        ]
+    ) as stream:
+        for text in stream.text_stream:
+            chunks.append(text)
+            on_text(text)
+        truncated = stream.get_final_message().stop_reason == "max_tokens"
+    
+    return "".join(chunks), truncated
+
+def split_code_variants(text):
+    """
+    Split a batched Claude response into {auth method: code} on its marker lines
+    
+    AUTO_DETECT maps to the variant of the method named on the documented-method line,
+    or to AUTH_METHODS[0] when that line is missing or names some other method.
+    """
+    parts = _VARIANT_MARKER_RX.split(text)
+    # parts = [preamble, method, code, method, code, ...]
+    variants = {
+        method.strip(): code.strip() + "\n"
+        for method, code in zip(parts[1::2], parts[2::2])
+        if code.strip()
+    }
+    
+    documented = _DOCUMENTED_MARKER_RX.search(parts[0])
+    documented_method = documented.group(1).strip() if documented else None
+    if documented_method not in AUTH_METHODS:
+        # e.g. "OAuth2" or "Personal Access Token" - don't let the wording sink the batch
+        documented_method = AUTH_METHODS[0]
+    if documented_method in variants:
+        variants[AUTO_DETECT] = variants[documented_method]
+    
+    return variants
+
+# (keywords, insight) pairs matched against the lowercased generated code
+_INSIGHT_RULES = (
+    (("oauth",), "• Detected OAuth 2.0 with refresh token flow"),
+    (("cursor",), "• Pagination uses cursor-based method"),
+    (("offset",), "• Pagination uses offset-based method"),
+    (("rate_limit", "ratelimit"), "• Rate limiting implemented with backoff"),
+    (("retry",), "• Automatic retry logic included"),
+)
 
 def extract_insights(code, api_url):
     """Extract insights from generated code"""
-    insights = []
-    
-    if "OAuth" in code or "oauth" in code:
-        insights.append("• Detected OAuth 2.0 with refresh token flow")
-    if "cursor" in code.lower():
-        insights.append("• Pagination uses cursor-based method")
-    if "offset" in code.lower():
-        insights.append("• Pagination uses offset-based method")
-    if "rate_limit" in code.lower() or "RateLimit" in code:
-        insights.append("• Rate limiting implemented with backoff")
-    if "retry" in code.lower():
-        insights.append("• Automatic retry logic included")
+    # Lowercase once and reuse for every rule
+    code_lower = code.lower()
+    insights = [insight for keywords, insight in _INSIGHT_RULES
+                if any(keyword in code_lower for keyword in keywords)]
     
     # Estimate endpoints
     endpoint_count = code.count("def get_") + code.count("def list_")
@@ -281,6 +516,11 @@ def extract_insights(code, api_url):
     
     return insights
 
+@st.cache_resource(show_spinner=False)
+def _demo_code() -> str:
+    """Pre-generated demo integration, read from disk once per server process"""
+    return DEMO_CODE_PATH.read_text(encoding="utf-8")
+
 def generate_demo_code(api_doc_url, auth_method):
     """Generate demo code when Claude API is not available"""
     
@@ -291,711 +531,388 @@ def generate_demo_code(api_doc_url, auth_method):
         "• Rate limit: 500 requests/minute"
     ]
     
-    return '''"""
-Calendly API Integration - Production Ready
-Generated by CloudEagle AI Integration Builder
-"""
+    return _demo_code()
 
-import requests
-from typing import Dict, List, Optional
-import os
-import time
-import logging
-from datetime import datetime, timedelta
-
-# Configure logging
-logging.basicConfig(
-    level=logging.INFO,
-    format='%(asctime)s - %(name)s - %(levelname)s - %(message)s'
+# Every keyword analyze_code_quality looks for, matched in one pass
+_QUALITY_RX = re.compile(
+    r"os\.environ|try:|except|pagination|cursor|rate_limit|429|logging|logger|hardcode",
+    re.IGNORECASE
 )
-logger = logging.getLogger(__name__)
-
 
-class CalendlyAuth:
-    """Handles OAuth 2.0 authentication for Calendly API"""
+# str hashes are memoized on the object, so re-hashing the same code on reruns is free
+@st.cache_data(show_spinner=False, max_entries=32, hash_funcs={str: hash})
+def analyze_code_quality(code):
+    """Analyze generated code quality"""
     
-    def __init__(self, client_id: str, client_secret: str):
-        """
-        Initialize Calendly authentication
-        
-        Args:
-            client_id: OAuth client ID from Calendly
-            client_secret: OAuth client secret from Calendly
-        """
-        self.client_id = client_id
-        self.client_secret = client_secret
-        self.access_token: Optional[str] = None
-        self.refresh_token: Optional[str] = None
-        self.token_expires_at: Optional[datetime] = None
-        self.base_auth_url = "https://auth.calendly.com/oauth"
-        
-        logger.info("Calendly authentication initialized")
+    hits = {match.group(0).lower() for match in _QUALITY_RX.finditer(code)}
     
-    def get_authorization_url(self, redirect_uri: str) -> str:
-        """
-        Generate OAuth authorization URL
-        
-        Args:
-            redirect_uri: Callback URL after authorization
-            
-        Returns:
-            Authorization URL for user to visit
-        """
-        return (
-            f"{self.base_auth_url}/authorize?"
-            f"client_id={self.client_id}&"
-            f"redirect_uri={redirect_uri}&"
-            f"response_type=code"
-        )
+    metrics = {
+        "security": "✓ Passed" if "os.environ" in hits and "hardcode" not in hits else "⚠️ Warning",
+        "error_handling": "✓ Passed" if "try:" in hits and "except" in hits else "⚠️ Warning",
+        "pagination": "✓ Passed" if "pagination" in hits or "cursor" in hits else "⚠️ Warning",
+        "rate_limiting": "✓ Passed" if "rate_limit" in hits or "429" in hits else "⚠️ Warning",
+        "logging": "✓ Passed" if "logging" in hits or "logger" in hits else "⚠️ Warning",
+        "best_practices": "✓ Passed" if "type hints" in code or ":" in code[:1000] else "⚠️ Warning"
+    }
     
-    def exchange_code_for_token(self, code: str, redirect_uri: str) -> Dict:
-        """
-        Exchange authorization code for access token
-        
-        Args:
-            code: Authorization code from OAuth callback
-            redirect_uri: Same redirect URI used in authorization
-            
-        Returns:
-            Token response with access_token and refresh_token
-        """
-        try:
-            response = requests.post(
-                f"{self.base_auth_url}/token",
-                data={
-                    "grant_type": "authorization_code",
-                    "code": code,
-                    "redirect_uri": redirect_uri,
-                    "client_id": self.client_id,
-                    "client_secret": self.client_secret
-                },
-                timeout=30
-            )
-            response.raise_for_status()
-            
-            token_data = response.json()
-            self.access_token = token_data.get("access_token")
-            self.refresh_token = token_data.get("refresh_token")
-            
-            # Calculate expiration (Calendly tokens expire in 2 hours)
-            expires_in = token_data.get("expires_in", 7200)
-            self.token_expires_at = datetime.now() + timedelta(seconds=expires_in)
-            
-            logger.info("Successfully obtained access token")
-            return token_data
-            
-        except requests.exceptions.RequestException as e:
-            logger.error(f"Token exchange failed: {str(e)}")
-            raise
+    # Calculate overall score
+    passed = sum(1 for v in metrics.values() if "✓" in v)
+    score = (passed / len(metrics)) * 10
     
-    def refresh_access_token(self) -> Dict:
-        """
-        Refresh expired access token using refresh token
-        
-        Returns:
-            New token response
-        """
-        if not self.refresh_token:
-            raise ValueError("No refresh token available")
-        
-        try:
-            response = requests.post(
-                f"{self.base_auth_url}/token",
-                data={
-                    "grant_type": "refresh_token",
-                    "refresh_token": self.refresh_token,
-                    "client_id": self.client_id,
-                    "client_secret": self.client_secret
-                },
-                timeout=30
-            )
-            response.raise_for_status()
-            
-            token_data = response.json()
-            self.access_token = token_data.get("access_token")
-            
-            # Update expiration
-            expires_in = token_data.get("expires_in", 7200)
-            self.token_expires_at = datetime.now() + timedelta(seconds=expires_in)
-            
-            logger.info("Access token refreshed successfully")
-            return token_data
-            
-        except requests.exceptions.RequestException as e:
-            logger.error(f"Token refresh failed: {str(e)}")
-            raise
+    return metrics, score
+
+def index_code_sections(code):
+    """Locate the Step 3 auth setup and API client previews (as slices) in the generated code"""
+    # Extract auth section (simplified)
+    code_index = {"auth": slice(0, 2000), "client": None}
     
-    def get_valid_token(self) -> str:
-        """
-        Get valid access token, refreshing if necessary
-        
-        Returns:
-            Valid access token
-        """
-        # Check if token needs refresh (refresh 5 minutes before expiry)
-        if self.token_expires_at:
-            time_until_expiry = (self.token_expires_at - datetime.now()).total_seconds()
-            if time_until_expiry < 300:  # Less than 5 minutes
-                logger.info("Token expiring soon, refreshing...")
-                self.refresh_access_token()
-        
-        return self.access_token
+    # Extract client section
+    if "class" in code:
+        client_start = code.find("class", 500)
+        code_index["client"] = slice(client_start, client_start + 2000)
+    
+    return code_index
 
+def store_generated_code(code):
+    """Set the generated code, indexing its sections once rather than on every Step 3 rerun"""
+    st.session_state.generated_code = code
+    st.session_state.code_index = None if code is None else index_code_sections(code)
+    # New code gets its own sandbox run, README stamp and deployment
+    st.session_state.sandbox_passed = False
+    st.session_state.validation_results = {}
+    st.session_state.deploy_timestamp = None
+    st.session_state.deployed = False
 
-class CalendlyClient:
-    """Main Calendly API client"""
+@st.fragment
+def render_sidebar():
+    """Sidebar progress and settings"""
+    st.markdown("### ☁️ CloudEagle")
+    st.markdown("---")
+    st.markdown("### 🎯 Progress")
     
-    def __init__(self, auth: CalendlyAuth):
-        """
-        Initialize Calendly client
-        
-        Args:
-            auth: CalendlyAuth instance with valid credentials
-        """
-        self.auth = auth
-        self.base_url = "https://api.calendly.com"
-        self.session = requests.Session()
-        self.session.headers.update({
-            "Content-Type": "application/json"
-        })
-        
-        logger.info("Calendly client initialized")
-    
-    def _make_request(
-        self, 
-        method: str, 
-        endpoint: str, 
-        **kwargs
-    ) -> requests.Response:
-        """
-        Make authenticated API request with retry logic
-        
-        Args:
-            method: HTTP method (GET, POST, etc.)
-            endpoint: API endpoint path
-            **kwargs: Additional request parameters
-            
-        Returns:
-            Response object
-        """
-        url = f"{self.base_url}/{endpoint.lstrip('/')}"
-        
-        # Add authorization header
-        token = self.auth.get_valid_token()
-        headers = kwargs.pop('headers', {})
-        headers['Authorization'] = f'Bearer {token}'
-        
-        # Retry logic with exponential backoff
-        max_retries = 3
-        for attempt in range(max_retries):
-            try:
-                response = self.session.request(
-                    method=method,
-                    url=url,
-                    headers=headers,
-                    timeout=30,
-                    **kwargs
-                )
-                
-                # Handle rate limiting
-                if response.status_code == 429:
-                    retry_after = int(response.headers.get('Retry-After', 60))
-                    logger.warning(f"Rate limited. Waiting {retry_after} seconds...")
-                    time.sleep(retry_after)
-                    continue
-                
-                response.raise_for_status()
-                return response
-                
-            except requests.exceptions.RequestException as e:
-                if attempt < max_retries - 1:
-                    wait_time = 2 ** attempt  # Exponential backoff
-                    logger.warning(f"Request failed. Retrying in {wait_time}s...")
-                    time.sleep(wait_time)
-                else:
-                    logger.error(f"Request failed after {max_retries} attempts: {str(e)}")
-                    raise
-    
-    def get_current_user(self) -> Dict:
-        """
-        Get current authenticated user
-        
-        Returns:
-            User object
-        """
-        response = self._make_request('GET', '/users/me')
-        return response.json()
-    
-    def list_users(self, organization_uri: str, max_results: int = 100) -> List[Dict]:
-        """
-        List all users in organization with automatic pagination
-        
-        Args:
-            organization_uri: Organization URI
-            max_results: Maximum number of results to return
-            
-        Returns:
-            List of user objects
-        """
-        all_users = []
-        page_token = None
-        
-        while len(all_users) < max_results:
-            params = {
-                'organization': organization_uri,
-                'count': min(100, max_results - len(all_users))
-            }
-            
-            if page_token:
-                params['page_token'] = page_token
-            
-            response = self._make_request('GET', '/users', params=params)
-            data = response.json()
-            
-            users = data.get('collection', [])
-            all_users.extend(users)
-            
-            # Check for next page
-            pagination = data.get('pagination', {})
-            page_token = pagination.get('next_page_token')
-            
-            if not page_token or len(all_users) >= max_results:
-                break
-            
-            logger.info(f"Fetched {len(all_users)} users so far...")
-        
-        logger.info(f"Total users retrieved: {len(all_users)}")
-        return all_users[:max_results]
+    steps = [
+        ("1️⃣ Configure", 1),
+        ("2️⃣ Generate", 2),
+        ("3️⃣ Review Code", 3),
+        ("4️⃣ Test Sandbox", 4),
+        ("5️⃣ Deploy", 5)
+    ]
     
-    def get_event_types(self, user_uri: str) -> List[Dict]:
-        """
-        Get event types for a user
-        
-        Args:
-            user_uri: User URI
-            
-        Returns:
-            List of event type objects
-        """
-        all_event_types = []
-        page_token = None
-        
-        while True:
-            params = {'user': user_uri, 'count': 100}
-            
-            if page_token:
-                params['page_token'] = page_token
-            
-            response = self._make_request('GET', '/event_types', params=params)
-            data = response.json()
-            
-            event_types = data.get('collection', [])
-            all_event_types.extend(event_types)
-            
-            # Check for next page
-            pagination = data.get('pagination', {})
-            page_token = pagination.get('next_page_token')
-            
-            if not page_token:
-                break
-        
-        logger.info(f"Retrieved {len(all_event_types)} event types")
-        return all_event_types
-    
-    def get_scheduled_events(
-        self, 
-        organization_uri: str,
-        min_start_time: Optional[str] = None,
-        max_start_time: Optional[str] = None
-    ) -> List[Dict]:
-        """
-        Get scheduled events with optional date filtering
-        
-        Args:
-            organization_uri: Organization URI
-            min_start_time: Filter events after this time (ISO 8601)
-            max_start_time: Filter events before this time (ISO 8601)
-            
-        Returns:
-            List of event objects
-        """
-        all_events = []
-        page_token = None
-        
-        while True:
-            params = {
-                'organization': organization_uri,
-                'count': 100
-            }
-            
-            if min_start_time:
-                params['min_start_time'] = min_start_time
-            if max_start_time:
-                params['max_start_time'] = max_start_time
-            if page_token:
-                params['page_token'] = page_token
-            
-            response = self._make_request('GET', '/scheduled_events', params=params)
-            data = response.json()
-            
-            events = data.get('collection', [])
-            all_events.extend(events)
-            
-            # Check for next page
-            pagination = data.get('pagination', {})
-            page_token = pagination.get('next_page_token')
-            
-            if not page_token:
-                break
-        
-        logger.info(f"Retrieved {len(all_events)} scheduled events")
-        return all_events
-
+    for step_name, step_num in steps:
+        if st.session_state.step >= step_num:
+            st.markdown(f"**{step_name}** ✓")
+        else:
+            st.markdown(f"{step_name}")
+    
+    st.markdown("---")
+    st.markdown("### ⚙️ Settings")
+    
+    # API Key input (optional, for testing)
+    with st.expander("🔑 API Configuration"):
+        api_key = st.text_input("Anthropic API Key (Optional)", type="password", 
+                               help="If not provided, demo mode will be used")
+        if api_key:
+            if api_key != st.session_state.get('anthropic_key'):
+                # Key rotated - drop clients built for previous keys
+                _get_anthropic_client.clear()
+            st.session_state.anthropic_key = api_key
+            st.success("API key configured!")
 
-# Example usage
-if __name__ == "__main__":
-    # Initialize from environment variables (never hardcode!)
-    client_id = os.environ.get("CALENDLY_CLIENT_ID")
-    client_secret = os.environ.get("CALENDLY_CLIENT_SECRET")
+# Step 1: Configure Integration
+@st.fragment
+def render_step_1():
+    st.markdown(STEP_BADGE_TMPL.format(n=1, title="Configure Your Integration"), unsafe_allow_html=True)
     
-    if not client_id or not client_secret:
-        raise ValueError("Missing CALENDLY_CLIENT_ID or CALENDLY_CLIENT_SECRET")
+    st.markdown("""
+    <div class="info-box">
+        💡 <strong>Getting Started:</strong> Paste any API documentation URL and select your authentication method. 
+        Our AI will analyze the documentation and generate production-ready integration code.
+    </div>
+    """, unsafe_allow_html=True)
     
-    # Set up authentication
-    auth = CalendlyAuth(client_id=client_id, client_secret=client_secret)
+    col1, col2 = st.columns([2, 1])
     
-    # For OAuth flow, you would:
-    # 1. Redirect user to: auth.get_authorization_url(redirect_uri)
-    # 2. Handle callback and exchange code
-    # auth.exchange_code_for_token(code, redirect_uri)
+    with col1:
+        st.markdown("#### 📄 API Documentation")
+        api_doc_url = st.text_input(
+            "API Documentation URL",
+            value="https://developer.calendly.com/api-docs/4b402d5ab3edd-calendly-developer",
+            help="Paste the URL of the API documentation (Swagger, OpenAPI, or standard docs)",
+            label_visibility="collapsed"
+        )
+        st.session_state.api_doc_url = api_doc_url
     
-    # Create client
-    client = CalendlyClient(auth=auth)
+    with col2:
+        st.markdown("#### 💻 Programming Language")
+        language = st.selectbox(
+            "Select Language",
+            ["Python"],
+            help="Select the programming language for generated code",
+            label_visibility="collapsed"
+        )
     
-    # Get current user
-    user = client.get_current_user()
-    print(f"Authenticated as: {user['resource']['name']}")
+    st.markdown("#### 🔐 Authentication Method")
+    auth_col1, auth_col2, auth_col3, auth_col4 = st.columns(4)
     
-    # List users in organization
-    org_uri = user['resource']['current_organization']
-    users = client.list_users(organization_uri=org_uri, max_results=50)
-    print(f"Found {len(users)} users")
+    with auth_col1:
+        if st.button("OAuth 2.0 (Recommended)", 
+                    use_container_width=True, 
+                    type="primary" if st.session_state.auth_method == "OAuth 2.0" else "secondary"):
+            st.session_state.auth_method = "OAuth 2.0"
+            st.rerun()
+    with auth_col2:
+        if st.button("API Key", 
+                    use_container_width=True,
+                    type="primary" if st.session_state.auth_method == "API Key" else "secondary"):
+            st.session_state.auth_method = "API Key"
+            st.rerun()
+    with auth_col3:
+        if st.button("Bearer Token", 
+                    use_container_width=True,
+                    type="primary" if st.session_state.auth_method == "Bearer Token" else "secondary"):
+            st.session_state.auth_method = "Bearer Token"
+            st.rerun()
+    with auth_col4:
+        if st.button(AUTO_DETECT, 
+                    use_container_width=True,
+                    type="primary" if st.session_state.auth_method == AUTO_DETECT else "secondary"):
+            st.session_state.auth_method = AUTO_DETECT
+            st.rerun()
     
-    # Get scheduled events
-    events = client.get_scheduled_events(organization_uri=org_uri)
-    print(f"Found {len(events)} scheduled events")
-'''
-
-def analyze_code_quality(code):
-    """Analyze generated code quality"""
+    st.info(f"✅ Selected: {st.session_state.auth_method}")
     
-    metrics = {
-        "security": "✓ Passed" if "os.environ" in code and "hardcode" not in code.lower() else "⚠️ Warning",
-        "error_handling": "✓ Passed" if "try:" in code and "except" in code else "⚠️ Warning",
-        "pagination": "✓ Passed" if "pagination" in code.lower() or "cursor" in code.lower() else "⚠️ Warning",
-        "rate_limiting": "✓ Passed" if "rate_limit" in code.lower() or "429" in code else "⚠️ Warning",
-        "logging": "✓ Passed" if "logging" in code.lower() or "logger" in code else "⚠️ Warning",
-        "best_practices": "✓ Passed" if "type hints" in code or ":" in code[:1000] else "⚠️ Warning"
+    # Permission Mode Selection
+    st.markdown("#### 🛡️ Safety Mode")
+    st.markdown("""
+    <div class="info-box" style="background-color: #e8f4f8; border-left: 4px solid #0078d4;">
+        <strong>🛡️ Read-Only Mode</strong> (Recommended for first deployment)<br/>
+        Your integration will start in read-only mode for safety. You can only retrieve data (GET requests). 
+        Write operations (POST/PUT/DELETE) can be enabled later after testing.
+    </div>
+    """, unsafe_allow_html=True)
+    
+    mode_col1, mode_col2, mode_col3 = st.columns(3)
+    
+    with mode_col1:
+        if st.button("🟢 Read-Only (Safe)", 
+                    use_container_width=True, 
+                    type="primary" if st.session_state.permission_mode == PermissionMode.READ_ONLY else "secondary",
+                    help="GET requests only - cannot modify data"):
+            st.session_state.permission_mode = PermissionMode.READ_ONLY
+            st.rerun()
+    with mode_col2:
+        if st.button("🟡 Read-Write", 
+                    use_container_width=True,
+                    type="primary" if st.session_state.permission_mode == PermissionMode.READ_WRITE else "secondary",
+                    help="GET, POST, PUT, PATCH - can create and update"):
+            st.session_state.permission_mode = PermissionMode.READ_WRITE
+            st.rerun()
+    with mode_col3:
+        if st.button("🔴 Full Access (Admin)", 
+                    use_container_width=True,
+                    type="primary" if st.session_state.permission_mode == PermissionMode.FULL_ACCESS else "secondary",
+                    help="All methods including DELETE - admin approval required"):
+            st.session_state.permission_mode = PermissionMode.FULL_ACCESS
+            st.rerun()
+    
+    mode_descriptions = {
+        PermissionMode.READ_ONLY: "🟢 Read-Only: GET requests only (safest)",
+        PermissionMode.READ_WRITE: "🟡 Read-Write: GET + POST/PUT/PATCH (can modify data)",
+        PermissionMode.FULL_ACCESS: "🔴 Full Access: All methods including DELETE (requires admin)"
     }
+    st.info(f"✅ **Current Mode:** {mode_descriptions[st.session_state.permission_mode]}")
     
-    # Calculate overall score
-    passed = sum(1 for v in metrics.values() if "✓" in v)
-    score = (passed / len(metrics)) * 10
+    if st.session_state.permission_mode != PermissionMode.READ_ONLY:
+        st.warning(f"⚠️ **Warning:** {st.session_state.permission_mode.replace('_', ' ').title()} mode can modify production data. Test thoroughly in sandbox!")
     
-    return metrics, score
+    # Advanced options
+    with st.expander("⚙️ Advanced Options (Optional)"):
+        col1, col2, col3 = st.columns(3)
+        with col1:
+            rate_limit = st.checkbox("Custom rate limit handling")
+        with col2:
+            webhooks = st.checkbox("Webhook support")
+        with col3:
+            retry = st.checkbox("Custom retry logic")
+    
+    st.markdown("---")
+    
+    if st.button("🚀 Generate Integration Code", type="primary", use_container_width=True):
+        cancel_generation()
+        store_generated_code(None)
+        st.session_state.step = 2
+        st.rerun()
 
-# Main App
-def main():
-    # Header
+# Step 2: Generate Code
+def render_step_2():
+    st.markdown(STEP_BADGE_TMPL.format(n=2, title="AI Code Generation"), unsafe_allow_html=True)
+    
+    # Generate code
+    if st.session_state.generation is None and st.session_state.generated_code is None:
+        store_generated_code(generate_integration_code(
+            st.session_state.api_doc_url,
+            st.session_state.auth_method
+        ))
+    
+    if st.session_state.generation is not None:
+        if not st.session_state.generation["future"].done():
+            render_generation_progress()
+            return
+        store_generated_code(finish_generation())
+    
+    # Show AI insights
     st.markdown("""
-    <div class="main-header">
-        <h1>☁️ CloudEagle AI Integration Builder</h1>
-        <p>Generate production-ready SaaS integrations in minutes, not weeks</p>
+    <div class="success-box">
+        <h4>🤖 AI Insights</h4>
     </div>
     """, unsafe_allow_html=True)
     
-    # Sidebar
-    with st.sidebar:
-        st.markdown("### ☁️ CloudEagle")
-        st.markdown("---")
-        st.markdown("### 🎯 Progress")
+    for insight in st.session_state.ai_insights:
+        st.markdown(insight)
+    
+    st.success("✅ Code generation complete!")
+    
+    if st.button("Review Generated Code →", type="primary"):
+        st.session_state.step = 3
+        st.rerun()
+
+@st.fragment(run_every=0.5)
+def render_generation_progress():
+    """Poll the background generation, showing streamed code until it finishes"""
+    generation = st.session_state.generation
+    if generation is None or generation["future"].done():
+        # Finished (or cancelled) - rerun the whole app so Step 2 renders the result
+        st.rerun()
+    
+    with st.status("🤖 AI is generating your integration code...", expanded=True):
+        chunks = generation["chunks"]
+        if chunks:
+            # Snapshot the list - the worker thread is still appending to it
+            st.code("".join(list(chunks)), language="python")
+        else:
+            st.write("Analyzing API documentation and generating code...")
+    
+    if st.button("✖ Cancel"):
+        cancel_generation()
+        st.session_state.step = 1
+        st.rerun()
+
+# Step 3: Review Code
+@st.fragment
+def render_step_3():
+    st.markdown(STEP_BADGE_TMPL.format(n=3, title="Review Generated Code"), unsafe_allow_html=True)
+    
+    col1, col2 = st.columns([2, 1])
+    
+    with col1:
+        st.markdown("#### 📝 Generated Integration Code")
+        
+        # Section picker - unlike st.tabs, only the selected section is sent to the browser
+        section = st.radio(
+            "Code section",
+            ["Full Code", "Auth Setup", "API Client"],
+            horizontal=True,
+            key="active_tab",
+            label_visibility="collapsed"
+        )
+        code = st.session_state.generated_code
+        code_index = st.session_state.code_index
+        
+        if section == "Full Code":
+            st.code(code, language="python", line_numbers=True)
+        elif section == "Auth Setup":
+            st.code(code[code_index["auth"]], language="python")
+        elif code_index["client"] is not None:
+            st.code(code[code_index["client"]], language="python")
+    
+    with col2:
+        st.markdown("#### 📋 Code Quality Report")
         
-        steps = [
-            ("1️⃣ Configure", 1),
-            ("2️⃣ Generate", 2),
-            ("3️⃣ Review Code", 3),
-            ("4️⃣ Test Sandbox", 4),
-            ("5️⃣ Deploy", 5)
-        ]
+        metrics, score = analyze_code_quality(st.session_state.generated_code)
         
-        for step_name, step_num in steps:
-            if st.session_state.step >= step_num:
-                st.markdown(f"**{step_name}** ✓")
-            else:
-                st.markdown(f"{step_name}")
+        st.markdown(METRIC_SCORE_TMPL.format(score=score), unsafe_allow_html=True)
         
         st.markdown("---")
-        st.markdown("### ⚙️ Settings")
-        
-        # API Key input (optional, for testing)
-        with st.expander("🔑 API Configuration"):
-            api_key = st.text_input("Anthropic API Key (Optional)", type="password", 
-                                   help="If not provided, demo mode will be used")
-            if api_key:
-                st.session_state.anthropic_key = api_key
-                st.success("API key configured!")
-    
-    # Step 1: Configure Integration
-    if st.session_state.step == 1:
-        st.markdown('<div class="step-badge">Step 1 of 5: Configure Your Integration</div>', unsafe_allow_html=True)
         
-        st.markdown("""
-        <div class="info-box">
-            💡 <strong>Getting Started:</strong> Paste any API documentation URL and select your authentication method. 
-            Our AI will analyze the documentation and generate production-ready integration code.
-        </div>
-        """, unsafe_allow_html=True)
-        
-        col1, col2 = st.columns([2, 1])
-        
-        with col1:
-            st.markdown("#### 📄 API Documentation")
-            api_doc_url = st.text_input(
-                "API Documentation URL",
-                value="https://developer.calendly.com/api-docs/4b402d5ab3edd-calendly-developer",
-                help="Paste the URL of the API documentation (Swagger, OpenAPI, or standard docs)",
-                label_visibility="collapsed"
-            )
-            st.session_state.api_doc_url = api_doc_url
-        
-        with col2:
-            st.markdown("#### 💻 Programming Language")
-            language = st.selectbox(
-                "Select Language",
-                ["Python"],
-                help="Select the programming language for generated code",
-                label_visibility="collapsed"
+        for metric, status in metrics.items():
+            st.markdown(
+                QUALITY_METRIC_TMPL.format(name=metric.replace('_', ' ').title(), status=status),
+                unsafe_allow_html=True
             )
-        
-        st.markdown("#### 🔐 Authentication Method")
-        auth_col1, auth_col2, auth_col3, auth_col4 = st.columns(4)
-        
-        with auth_col1:
-            if st.button("OAuth 2.0 (Recommended)", 
-                        use_container_width=True, 
-                        type="primary" if st.session_state.auth_method == "OAuth 2.0" else "secondary"):
-                st.session_state.auth_method = "OAuth 2.0"
-                st.rerun()
-        with auth_col2:
-            if st.button("API Key", 
-                        use_container_width=True,
-                        type="primary" if st.session_state.auth_method == "API Key" else "secondary"):
-                st.session_state.auth_method = "API Key"
-                st.rerun()
-        with auth_col3:
-            if st.button("Bearer Token", 
-                        use_container_width=True,
-                        type="primary" if st.session_state.auth_method == "Bearer Token" else "secondary"):
-                st.session_state.auth_method = "Bearer Token"
-                st.rerun()
-        with auth_col4:
-            if st.button("Auto-detect", 
-                        use_container_width=True,
-                        type="primary" if st.session_state.auth_method == "Auto-detect" else "secondary"):
-                st.session_state.auth_method = "Auto-detect"
-                st.rerun()
-        
-        st.info(f"✅ Selected: {st.session_state.auth_method}")
-        
-        # Permission Mode Selection
-        st.markdown("#### 🛡️ Safety Mode")
-        st.markdown("""
-        <div class="info-box" style="background-color: #e8f4f8; border-left: 4px solid #0078d4;">
-            <strong>🛡️ Read-Only Mode</strong> (Recommended for first deployment)<br/>
-            Your integration will start in read-only mode for safety. You can only retrieve data (GET requests). 
-            Write operations (POST/PUT/DELETE) can be enabled later after testing.
-        </div>
-        """, unsafe_allow_html=True)
-        
-        mode_col1, mode_col2, mode_col3 = st.columns(3)
-        
-        with mode_col1:
-            if st.button("🟢 Read-Only (Safe)", 
-                        use_container_width=True, 
-                        type="primary" if st.session_state.permission_mode == PermissionMode.READ_ONLY else "secondary",
-                        help="GET requests only - cannot modify data"):
-                st.session_state.permission_mode = PermissionMode.READ_ONLY
-                st.rerun()
-        with mode_col2:
-            if st.button("🟡 Read-Write", 
-                        use_container_width=True,
-                        type="primary" if st.session_state.permission_mode == PermissionMode.READ_WRITE else "secondary",
-                        help="GET, POST, PUT, PATCH - can create and update"):
-                st.session_state.permission_mode = PermissionMode.READ_WRITE
-                st.rerun()
-        with mode_col3:
-            if st.button("🔴 Full Access (Admin)", 
-                        use_container_width=True,
-                        type="primary" if st.session_state.permission_mode == PermissionMode.FULL_ACCESS else "secondary",
-                        help="All methods including DELETE - admin approval required"):
-                st.session_state.permission_mode = PermissionMode.FULL_ACCESS
-                st.rerun()
-        
-        mode_descriptions = {
-            PermissionMode.READ_ONLY: "🟢 Read-Only: GET requests only (safest)",
-            PermissionMode.READ_WRITE: "🟡 Read-Write: GET + POST/PUT/PATCH (can modify data)",
-            PermissionMode.FULL_ACCESS: "🔴 Full Access: All methods including DELETE (requires admin)"
-        }
-        st.info(f"✅ **Current Mode:** {mode_descriptions[st.session_state.permission_mode]}")
-        
-        if st.session_state.permission_mode != PermissionMode.READ_ONLY:
-            st.warning(f"⚠️ **Warning:** {st.session_state.permission_mode.replace('_', ' ').title()} mode can modify production data. Test thoroughly in sandbox!")
-        
-        # Advanced options
-        with st.expander("⚙️ Advanced Options (Optional)"):
-            col1, col2, col3 = st.columns(3)
-            with col1:
-                rate_limit = st.checkbox("Custom rate limit handling")
-            with col2:
-                webhooks = st.checkbox("Webhook support")
-            with col3:
-                retry = st.checkbox("Custom retry logic")
-        
-        st.markdown("---")
-        
-        if st.button("🚀 Generate Integration Code", type="primary", use_container_width=True):
-            st.session_state.step = 2
-            st.rerun()
     
-    # Step 2: Generate Code
-    elif st.session_state.step == 2:
-        st.markdown('<div class="step-badge">Step 2 of 5: AI Code Generation</div>', unsafe_allow_html=True)
-        
-        # Show progress
-        progress_bar = st.progress(0)
-        status_text = st.empty()
-        
-        statuses = [
-            ("Analyzing API documentation...", 15),
-            ("Identifying authentication requirements...", 30),
-            ("Mapping API endpoints...", 50),
-            ("Generating authentication code...", 70),
-            ("Creating data retrieval methods...", 85),
-            ("Adding error handling and pagination...", 95),
-            ("Finalizing code...", 100)
-        ]
-        
-        for status, progress in statuses:
-            status_text.markdown(f"### {status}")
-            progress_bar.progress(progress)
-            time.sleep(0.5)
-        
-        # Generate code
-        with st.spinner("🤖 AI is generating your integration code..."):
-            code = generate_integration_code(
-                st.session_state.api_doc_url,
-                st.session_state.auth_method
-            )
-            st.session_state.generated_code = code
-        
-        # Show AI insights
-        st.markdown("""
-        <div class="success-box">
-            <h4>🤖 AI Insights</h4>
-        </div>
-        """, unsafe_allow_html=True)
-        
-        for insight in st.session_state.ai_insights:
-            st.markdown(insight)
-        
-        st.success("✅ Code generation complete!")
-        
-        if st.button("Review Generated Code →", type="primary"):
-            st.session_state.step = 3
+    st.markdown("---")
+    
+    col1, col2 = st.columns([1, 1])
+    with col1:
+        if st.button("← Back", use_container_width=True):
+            st.session_state.step = 1
+            st.rerun()
+    with col2:
+        if st.button("Test in Sandbox →", type="primary", use_container_width=True):
+            st.session_state.step = 4
             st.rerun()
+
+# Simulated sandbox test results shown in Step 4
+SANDBOX_TESTS = (
+    {
+        "name": "Authentication",
+        "status": "✅ Passed",
+        "details": "Connected successfully",
+        "extra": "• OAuth 2.0 token obtained\n• Token expires in: 2 hours"
+    },
+    {
+        "name": "Get Users",
+        "status": "✅ Passed",
+        "details": "Retrieved 25 users (validated ✓)",
+        "extra": "• All records have required fields (id, email, name)\n• All email formats valid\n• All IDs non-empty\n• Sample: sarah@company.com"
+    },
+    {
+        "name": "Pagination",
+        "status": "✅ Passed",
+        "details": "Iterated through 3 pages (75 records)",
+        "extra": "• Cursor-based pagination detected\n• All pages validated successfully"
+    },
+    {
+        "name": "Error Handling",
+        "status": "✅ Passed",
+        "details": "Gracefully handled 429 rate limit",
+        "extra": "• Exponential backoff working\n• No crashes on error scenarios"
+    }
+)
+
+# Extra check added when the integration runs in read-only mode
+PERMISSION_CHECK_TEST = {
+    "name": "Permission Check",
+    "status": "✅ Passed",
+    "details": "Read-only mode verified",
+    "extra": "• Only GET endpoints enabled\n• Write operations blocked ✓"
+}
+
+# Step 4: Sandbox Testing
+@st.fragment
+def render_step_4():
+    st.markdown(STEP_BADGE_TMPL.format(n=4, title="Test in Sandbox Environment"), unsafe_allow_html=True)
     
-    # Step 3: Review Code
-    elif st.session_state.step == 3:
-        st.markdown('<div class="step-badge">Step 3 of 5: Review Generated Code</div>', unsafe_allow_html=True)
-        
-        col1, col2 = st.columns([2, 1])
-        
-        with col1:
-            st.markdown("#### 📝 Generated Integration Code")
-            
-            # Tabs for different sections
-            tab1, tab2, tab3 = st.tabs(["Full Code", "Auth Setup", "API Client"])
-            
-            with tab1:
-                st.code(st.session_state.generated_code, language="python", line_numbers=True)
-            
-            with tab2:
-                # Extract auth section (simplified)
-                auth_section = st.session_state.generated_code[:2000]
-                st.code(auth_section, language="python")
-            
-            with tab3:
-                # Extract client section
-                if "class" in st.session_state.generated_code:
-                    client_start = st.session_state.generated_code.find("class", 500)
-                    client_section = st.session_state.generated_code[client_start:client_start+2000]
-                    st.code(client_section, language="python")
-        
-        with col2:
-            st.markdown("#### 📋 Code Quality Report")
-            
-            metrics, score = analyze_code_quality(st.session_state.generated_code)
-            
-            st.markdown(f'<div class="metric-score">{score:.1f}/10</div>', unsafe_allow_html=True)
-            
-            st.markdown("---")
-            
-            for metric, status in metrics.items():
-                st.markdown(f"""
-                <div class="code-quality-metric">
-                    <strong>{metric.replace('_', ' ').title()}</strong><br>
-                    {status}
-                </div>
-                """, unsafe_allow_html=True)
-        
-        st.markdown("---")
-        
-        col1, col2 = st.columns([1, 1])
-        with col1:
-            if st.button("← Back", use_container_width=True):
-                st.session_state.step = 1
-                st.rerun()
-        with col2:
-            if st.button("Test in Sandbox →", type="primary", use_container_width=True):
-                st.session_state.step = 4
-                st.rerun()
+    st.markdown(SANDBOX_WARNING_HTML, unsafe_allow_html=True)
     
-    # Step 4: Sandbox Testing
-    elif st.session_state.step == 4:
-        st.markdown('<div class="step-badge">Step 4 of 5: Test in Sandbox Environment</div>', unsafe_allow_html=True)
-        
-        st.markdown("""
-        <div class="warning-box">
-            🔒 <strong>Sandbox Environment:</strong> Test your integration safely before deploying to production. 
-            No real data will be affected.
-        </div>
-        """, unsafe_allow_html=True)
-        
-        # Test credentials
-        st.markdown("#### 🔑 Test Credentials")
-        col1, col2 = st.columns(2)
-        with col1:
-            st.text_input("Client ID", value="test_abc123******************", disabled=True)
-        with col2:
-            st.text_input("Client Secret", value="••••••••••••••••••••••", type="password", disabled=True)
-        
-        st.info("💡 Use test credentials provided by the API provider")
-        
-        st.markdown("---")
-        
-        # Run tests
-        st.markdown("#### 🧪 Run Integration Tests")
-        
+    # Test credentials
+    st.markdown("#### 🔑 Test Credentials")
+    col1, col2 = st.columns(2)
+    with col1:
+        st.text_input("Client ID", value="test_abc123******************", disabled=True)
+    with col2:
+        st.text_input("Client Secret", value="••••••••••••••••••••••", type="password", disabled=True)
+    
+    st.info("💡 Use test credentials provided by the API provider")
+    
+    st.markdown("---")
+    
+    # Run tests
+    st.markdown("#### 🧪 Run Integration Tests")
+    
+    # Only offer the run until it has passed; afterwards the results render from
+    # session state so Back/Deploy clicks don't re-run the simulation
+    if not st.session_state.sandbox_passed:
         if st.button("▶ Run All Tests", type="primary", use_container_width=True):
             # Simulate data validation
             validator = DataValidator()
@@ -1007,142 +924,76 @@ def main():
                 {"id": "user_003", "email": "mary@company.com", "name": "Mary Wilson"}
             ]
             
-            tests = [
-                {
-                    "name": "Authentication",
-                    "status": "✅ Passed",
-                    "details": "Connected successfully",
-                    "extra": "• OAuth 2.0 token obtained\n• Token expires in: 2 hours"
-                },
-                {
-                    "name": "Get Users",
-                    "status": "✅ Passed",
-                    "details": "Retrieved 25 users (validated ✓)",
-                    "extra": "• All records have required fields (id, email, name)\n• All email formats valid\n• All IDs non-empty\n• Sample: sarah@company.com"
-                },
-                {
-                    "name": "Pagination",
-                    "status": "✅ Passed",
-                    "details": "Iterated through 3 pages (75 records)",
-                    "extra": "• Cursor-based pagination detected\n• All pages validated successfully"
-                },
-                {
-                    "name": "Error Handling",
-                    "status": "✅ Passed",
-                    "details": "Gracefully handled 429 rate limit",
-                    "extra": "• Exponential backoff working\n• No crashes on error scenarios"
-                }
-            ]
+            tests = list(SANDBOX_TESTS)
             
             # Add validation test results based on permission mode
             if st.session_state.permission_mode == PermissionMode.READ_ONLY:
-                tests.append({
-                    "name": "Permission Check",
-                    "status": "✅ Passed",
-                    "details": "Read-only mode verified",
-                    "extra": "• Only GET endpoints enabled\n• Write operations blocked ✓"
-                })
-            
-            progress = st.progress(0)
-            for i, test in enumerate(tests):
-                with st.spinner(f"Running {test['name']} test..."):
-                    time.sleep(1)
-                    progress.progress((i + 1) / len(tests))
-                
-                with st.expander(f"**{test['name']}**: {test['status']}", expanded=(i==1)):
-                    st.write(test['details'])
-                    st.caption(test['extra'])
+                tests.append(PERMISSION_CHECK_TEST)
             
             # Store validation results
             st.session_state.validation_results = {
                 "users_validated": True,
                 "records_count": 25,
-                "validation_errors": []
+                "validation_errors": [],
+                "tests": tests,
+                "permission_mode": st.session_state.permission_mode
             }
             
             st.session_state.sandbox_passed = True
-            
-            st.markdown(f"""
-            <div class="success-box">
-                <h4>✅ All Tests Passed! ({len(tests)}/{len(tests)})</h4>
-                <p>Your integration is ready for production deployment.</p>
-                <p><strong>Safety Mode:</strong> {st.session_state.permission_mode.replace('_', ' ').title()}</p>
-            </div>
-            """, unsafe_allow_html=True)
-        
-        st.markdown("---")
-        
-        col1, col2 = st.columns([1, 1])
-        with col1:
-            if st.button("← Back to Code", use_container_width=True):
-                st.session_state.step = 3
+    
+    if st.session_state.sandbox_passed:
+        results = st.session_state.validation_results
+        tests = results["tests"]
+        
+        # Results are simulated, so report them in one go rather than pacing them with sleeps
+        st.progress(1.0)
+        for i, test in enumerate(tests):
+            with st.expander(f"**{test['name']}**: {test['status']}", expanded=(i==1)):
+                st.write(test['details'])
+                st.caption(test['extra'])
+        
+        st.markdown(TESTS_PASSED_TMPL.format(
+            passed=len(tests),
+            total=len(tests),
+            mode=results['permission_mode'].replace('_', ' ').title()
+        ), unsafe_allow_html=True)
+    
+    st.markdown("---")
+    
+    col1, col2 = st.columns([1, 1])
+    with col1:
+        if st.button("← Back to Code", use_container_width=True):
+            st.session_state.step = 3
+            st.rerun()
+    with col2:
+        if st.session_state.sandbox_passed:
+            if st.button("Deploy to Production →", type="primary", use_container_width=True):
+                st.session_state.step = 5
                 st.rerun()
-        with col2:
-            if st.session_state.sandbox_passed:
-                if st.button("Deploy to Production →", type="primary", use_container_width=True):
-                    st.session_state.step = 5
-                    st.rerun()
-            else:
-                st.button("Deploy to Production →", type="primary", use_container_width=True, disabled=True)
-                st.caption("Run tests first to enable deployment")
-    
-    # Step 5: Deploy
-    elif st.session_state.step == 5:
-        st.markdown('<div class="step-badge">Step 5 of 5: Deploy to Production</div>', unsafe_allow_html=True)
-        
-        st.markdown("""
-        <div class="warning-box">
-            ⚠️ <strong>Production Deployment:</strong> You're about to deploy this integration to your production environment.
-        </div>
-        """, unsafe_allow_html=True)
-        
-        # Pre-deployment checklist
-        st.markdown("#### ✅ Pre-Deployment Checklist")
-        st.checkbox("Sandbox tests passed", value=True, disabled=True)
-        st.checkbox("Production credentials configured", value=True, disabled=True)
-        st.checkbox("Error alerting enabled", value=True, disabled=True)
-        st.checkbox("Rate limit monitoring active", value=True, disabled=True)
-        code_review = st.checkbox("Code review approved (Optional)")
-        
-        st.markdown("---")
-        
-        # Deployment options
-        st.markdown("#### ⚙️ Deployment Options")
-        
-        col1, col2 = st.columns(2)
-        with col1:
-            environment = st.selectbox("Environment", ["Production", "Staging"])
-        with col2:
-            rollout = st.radio("Rollout Strategy", ["Full deployment", "Gradual (10% → 50% → 100%)"])
-        
-        st.checkbox("Alert on >5% error rate", value=True)
-        st.checkbox("Auto-rollback enabled", value=True)
-        
-        st.markdown("---")
-        
-        # Download artifacts
-        st.markdown("#### 📦 Generated Artifacts")
-        
-        col1, col2, col3 = st.columns(3)
-        with col1:
-            st.download_button(
-                label="📄 Download Python Code",
-                data=st.session_state.generated_code,
-                file_name="calendly_integration.py",
-                mime="text/plain",
-                use_container_width=True
-            )
-        with col2:
-            readme = f"""# Calendly Integration
+        else:
+            st.button("Deploy to Production →", type="primary", use_container_width=True, disabled=True)
+            st.caption("Run tests first to enable deployment")
+
+# Key on the builtin str hash (memoized on the object) so a hit skips the encode + md5
+# st.cache_resource would otherwise run over the whole payload to build its key
+@st.cache_resource(show_spinner=False, max_entries=64, hash_funcs={str: hash})
+def encode_download(text: str) -> bytes:
+    """UTF-8 payload for st.download_button, shared across sessions for identical artifacts"""
+    return text.encode("utf-8")
+
+@st.cache_data(show_spinner=False, ttl=3600, max_entries=32)
+def build_readme(generated_on: str) -> str:
+    """README shipped with the generated integration, built once per generation timestamp"""
+    return f"""# Calendly Integration
 
 Generated by CloudEagle AI Integration Builder
-Generated on: {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}
+Generated on: {generated_on}
 
 ## Setup
 
 1. Install dependencies:
 ```bash
-pip install requests
+pip install requests orjson
 ```
 
 2. Set environment variables:
@@ -1165,47 +1016,145 @@ python calendly_integration.py
 - Rate limit compliance
 - Structured logging
 """
-            st.download_button(
-                label="📋 Download README",
-                data=readme,
-                file_name="README.md",
-                mime="text/markdown",
-                use_container_width=True
-            )
-        with col3:
-            st.button("📊 View Monitoring Dashboard", use_container_width=True)
+
+# Step 5: Deploy
+PRE_DEPLOY_CHECKS = (
+    "Sandbox tests passed",
+    "Production credentials configured",
+    "Error alerting enabled",
+    "Rate limit monitoring active",
+)
+
+DEPLOY_ALERT_OPTIONS = (
+    "Alert on >5% error rate",
+    "Auto-rollback enabled",
+)
+
+@st.fragment
+def deployment_options():
+    """Checklist and deployment settings; toggling these only reruns this fragment"""
+    # Pre-deployment checklist
+    st.markdown("#### ✅ Pre-Deployment Checklist")
+    st.dataframe(
+        {"Check": list(PRE_DEPLOY_CHECKS), "Passed": [True] * len(PRE_DEPLOY_CHECKS)},
+        column_config={"Passed": st.column_config.CheckboxColumn()},
+        hide_index=True,
+        use_container_width=True
+    )
+    code_review = st.checkbox("Code review approved (Optional)")
+    
+    st.markdown("---")
+    
+    # Deployment options
+    st.markdown("#### ⚙️ Deployment Options")
+    
+    col1, col2 = st.columns(2)
+    with col1:
+        environment = st.selectbox("Environment", ["Production", "Staging"])
+    with col2:
+        rollout = st.radio("Rollout Strategy", ["Full deployment", "Gradual (10% → 50% → 100%)"])
+    
+    # One editable grid instead of a checkbox widget per option
+    st.data_editor(
+        {"Option": list(DEPLOY_ALERT_OPTIONS), "Enabled": [True] * len(DEPLOY_ALERT_OPTIONS)},
+        disabled=["Option"],
+        hide_index=True,
+        use_container_width=True,
+        key="deploy_alerts"
+    )
+
+@st.fragment
+def artifacts_section():
+    """Downloads and dashboard link; clicks here rerun only this fragment"""
+    # Download artifacts
+    st.markdown("#### 📦 Generated Artifacts")
+    
+    col1, col2, col3 = st.columns(3)
+    with col1:
+        st.download_button(
+            label="📄 Download Python Code",
+            data=encode_download(st.session_state.generated_code),
+            file_name="calendly_integration.py",
+            mime="text/plain",
+            use_container_width=True
+        )
+    with col2:
+        # Stamp once per session, so unrelated widget changes don't re-read the clock
+        # (setdefault would still evaluate datetime.now() on every rerun)
+        if st.session_state.deploy_timestamp is None:
+            from datetime import datetime
+            st.session_state.deploy_timestamp = datetime.now().strftime('%Y-%m-%d %H:%M:%S')
+        readme = build_readme(st.session_state.deploy_timestamp)
+        st.download_button(
+            label="📋 Download README",
+            data=encode_download(readme),
+            file_name="README.md",
+            mime="text/markdown",
+            use_container_width=True
+        )
+    with col3:
+        st.button("📊 View Monitoring Dashboard", use_container_width=True)
+
+def render_step_5():
+    st.markdown(STEP_BADGE_TMPL.format(n=5, title="Deploy to Production"), unsafe_allow_html=True)
+    
+    st.markdown(WARNING_BOX_PROD, unsafe_allow_html=True)
+    
+    deployment_options()
+    
+    st.markdown("---")
+    
+    artifacts_section()
+    
+    st.markdown("---")
+    
+    # Deploy button
+    if st.button("🚀 Deploy to Production", type="primary", use_container_width=True):
+        st.session_state.deployed = True
+        st.markdown(DEPLOY_PROGRESS_HTML, unsafe_allow_html=True)
+        st.balloons()
+    
+    # Rendered from the flag so the buttons below survive the rerun their own click triggers
+    if st.session_state.deployed:
+        st.success("✅ Successfully deployed to production!")
         
-        st.markdown("---")
+        st.markdown(DEPLOY_COMPLETE_HTML, unsafe_allow_html=True)
         
-        # Deploy button
-        if st.button("🚀 Deploy to Production", type="primary", use_container_width=True):
-            with st.spinner("Deploying..."):
-                progress = st.progress(0)
-                for i in range(100):
-                    time.sleep(0.02)
-                    progress.progress(i + 1)
-            
-            st.success("✅ Successfully deployed to production!")
-            st.balloons()
-            
-            st.markdown("""
-            <div class="success-box">
-                <h4>🎉 Deployment Complete!</h4>
-                <p>Your Calendly integration is now live in production.</p>
-                <p><strong>Next Steps:</strong></p>
-                <ul>
-                    <li>Monitor the dashboard for API health</li>
-                    <li>Check logs for any errors</li>
-                    <li>Set up alerting rules</li>
-                </ul>
-            </div>
-            """, unsafe_allow_html=True)
-            
-            if st.button("Start New Integration"):
-                st.session_state.step = 1
-                st.session_state.generated_code = None
-                st.session_state.sandbox_passed = False
-                st.rerun()
+        if st.button("Start New Integration"):
+            st.session_state.step = 1
+            # Also resets the sandbox run, README stamp and deployed flag
+            store_generated_code(None)
+            st.rerun()
+
+STEPS = {
+    1: render_step_1,
+    2: render_step_2,
+    3: render_step_3,
+    4: render_step_4,
+    5: render_step_5,
+}
+
+# Main App
+def main():
+    # Streamlit drops any element not re-sent on a rerun, so the stylesheet is emitted
+    # every run (wrapping this in st.cache_resource would just replay the same message)
+    st.markdown(_CSS, unsafe_allow_html=True)
+    
+    # Header
+    st.markdown("""
+    <div class="main-header">
+        <h1>☁️ CloudEagle AI Integration Builder</h1>
+        <p>Generate production-ready SaaS integrations in minutes, not weeks</p>
+    </div>
+    """, unsafe_allow_html=True)
+    
+    # Sidebar
+    with st.sidebar:
+        render_sidebar()
+    
+    # Steps render through fragments (Step 2 polls through one), so most widget
+    # interactions rerun only that part of the page
+    STEPS[st.session_state.step]()
 
 if __name__ == "__main__":
     main()